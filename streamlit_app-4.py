@@ -8,54 +8,118 @@ Vocab Trainer (DE ↔ FR) – Streamlit Version
 - Toleranter Vergleich: Groß-/Kleinschreibung + Akzente egal
 """
 
-import json, os, random, unicodedata, io
+import hashlib, importlib.util, json, os, posixpath, random, re, sys, tempfile, threading, unicodedata, io, zipfile
 from dataclasses import dataclass
-from typing import List, Dict, Tuple, Optional
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, List, Dict, Tuple, Optional
 
 import streamlit as st
 
-# Optional: .docx-Import
-DOCX_AVAILABLE = True
-try:
-    from docx import Document  # type: ignore
-except Exception:
-    DOCX_AVAILABLE = False
+# Optional: .docx-Import (das Hauptdokument wird direkt mit lxml gelesen).
+# lxml wird erst in import_docx geladen; hier nur prüfen, ob es installiert ist.
+DOCX_AVAILABLE = importlib.util.find_spec("lxml") is not None
 
 APP_DIR = os.path.abspath(os.path.dirname(__file__))
 STORE_PATH = os.path.join(APP_DIR, "vocab_store.json")
 
+# Häufig verglichene Werte interniert: Gleichheit wird damit meist zum Zeigervergleich
+_DE_FR = sys.intern("DE→FR")
+_FR_DE = sys.intern("FR→DE")
+_ALL = sys.intern("(alle)")
+
 # -------------------- Helpers --------------------
 
+_WS_RE = re.compile(r"\s+")
+# Kombinierende diakritische Zeichen (U+0300–U+036F): deckt alle DE/FR-Akzente nach NFKD ab
+_COMBINING = dict.fromkeys(range(0x300, 0x370))
+
+@lru_cache(maxsize=4096)
 def normalize(s: str) -> str:
-    s = s.strip().lower()
-    s = " ".join(s.split())
+    s = _WS_RE.sub(" ", s.strip().lower())
+    if s.isascii():
+        # Reines ASCII: NFKD ändert nichts, keine Akzente zu entfernen
+        return s
     s = unicodedata.normalize("NFKD", s)
-    s = "".join(ch for ch in s if not unicodedata.combining(ch))
-    return s
+    return s.translate(_COMBINING)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Entry:
     de: str
     fr: str
     source: str = ""
 
+@st.cache_resource
 def load_store() -> Dict:
     if not os.path.exists(STORE_PATH):
         return {"collections": []}
     try:
         with open(STORE_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
+            store = json.load(f)
     except Exception:
         # Fallback falls Datei korrupt ist
         return {"collections": []}
+    for coll in store.get("collections", []):
+        if isinstance(coll.get("name"), str):
+            coll["name"] = sys.intern(coll["name"])
+    return store
+
+@st.cache_resource
+def _disk_state() -> Dict:
+    # Prozessweit wie der Store selbst: Digest des zuletzt geschriebenen Inhalts + Schreib-Lock.
+    # Die umask nur einmal pro Prozess auslesen (os.umask setzt sie dabei kurz um).
+    umask = os.umask(0)
+    os.umask(umask)
+    return {"lock": threading.Lock(), "digest": None, "new_mode": 0o666 & ~umask}
+
+def mark_dirty():
+    st.session_state["_store_dirty"] = True
+    get_all_entries.clear()
 
 def save_store(store: Dict):
+    # Nur schreiben, wenn seit dem letzten Speichern etwas geändert wurde
+    if not st.session_state.get("_store_dirty"):
+        return
+    disk = _disk_state()
+    tmp_path = None
     try:
-        with open(STORE_PATH, "w", encoding="utf-8") as f:
-            json.dump(store, f, ensure_ascii=False, indent=2)
+        with disk["lock"]:
+            data = json.dumps(store, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            digest = hashlib.blake2b(data, digest_size=8).digest()
+            if digest != disk["digest"]:
+                # Atomar schreiben: eigene Temp-Datei je Schreibvorgang (Sessions teilen sich den Store),
+                # dann umbenennen (kein halb geschriebenes JSON)
+                with tempfile.NamedTemporaryFile(dir=APP_DIR, prefix="vocab_store.", suffix=".tmp",
+                                                 delete=False) as f:
+                    tmp_path = f.name
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                # Temp-Dateien sind 0600; Rechte der bestehenden Datei bzw. wie open(..., "w") übernehmen
+                try:
+                    mode = os.stat(STORE_PATH).st_mode & 0o7777
+                except FileNotFoundError:
+                    mode = disk["new_mode"]
+                os.chmod(tmp_path, mode)
+                os.replace(tmp_path, STORE_PATH)
+                tmp_path = None
+                disk["digest"] = digest
+        st.session_state["_store_dirty"] = False
     except Exception as e:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
         st.warning(f"Konnte Datenbank nicht speichern: {e}")
 
+def _store_fingerprint(store: Dict) -> Tuple[int, int, int]:
+    colls = store.get("collections", [])
+    return id(store), len(colls), sum(len(c.get("items", [])) for c in colls)
+
+# cache_resource statt cache_data: liefert bei jedem Rerun dieselbe Liste (kein Pickle-Roundtrip).
+# Nach Änderungen am Store wird der Cache über mark_dirty() geleert.
+@st.cache_resource(hash_funcs={dict: _store_fingerprint})
 def get_all_entries(store: Dict) -> List[Entry]:
     out: List[Entry] = []
     for coll in store.get("collections", []):
@@ -64,50 +128,106 @@ def get_all_entries(store: Dict) -> List[Entry]:
             out.append(Entry(de=it["de"], fr=it["fr"], source=src))
     return out
 
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_TBL, W_TR, W_TC, W_P, W_T = (_W_NS + t for t in ("tbl", "tr", "tc", "p", "t"))
+W_R, W_TAB, W_PTAB, W_BR, W_CR, W_NBH, W_TYPE = (
+    _W_NS + t for t in ("r", "tab", "ptab", "br", "cr", "noBreakHyphen", "type"))
+
+_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_OFFICE_DOCUMENT_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+# Wie python-docx: keine Entities auflösen (sonst XXE über hochgeladene Dateien), kein Netzwerk
+_SAFE_PARSE = dict(resolve_entities=False, no_network=True)
+
+def _main_part_name(zf: zipfile.ZipFile, etree) -> str:
+    # Hauptdokument über die officeDocument-Beziehung in _rels/.rels finden (nicht fest "word/document.xml")
+    rels = etree.fromstring(zf.read("_rels/.rels"), etree.XMLParser(**_SAFE_PARSE))
+    for rel in rels.iter(_REL_NS + "Relationship"):
+        if rel.get("Type") == _OFFICE_DOCUMENT_REL and rel.get("TargetMode") != "External":
+            return posixpath.normpath(rel.get("Target", "")).lstrip("/")
+    raise ValueError("Kein Hauptdokument (officeDocument) in der .docx gefunden.")
+
+def _run_text(p) -> str:
+    # Wie python-docx run.text: nur Inhalte von <w:r> (nicht die Tabstopps in <w:pPr>),
+    # Tab -> "\t", Zeilenumbruch -> "\n"; Seiten-/Spaltenumbrüche ergeben keinen Text
+    parts: List[str] = []
+    for r in p.iter(W_R):
+        for ch in r:
+            tag = ch.tag
+            if tag == W_T:
+                parts.append(ch.text or "")
+            elif tag in (W_TAB, W_PTAB):
+                parts.append("\t")
+            elif tag == W_CR or (tag == W_BR and ch.get(W_TYPE, "textWrapping") == "textWrapping"):
+                parts.append("\n")
+            elif tag == W_NBH:
+                parts.append("-")
+    return "".join(parts)
+
+def _release(elem):
+    # Bereits verarbeitete Elemente freigeben, damit der Speicher begrenzt bleibt
+    elem.clear()
+    while elem.getprevious() is not None:
+        del elem.getparent()[0]
+
 def import_docx(file_like, name_hint: str) -> Tuple[str, List[Entry]]:
     if not DOCX_AVAILABLE:
-        raise RuntimeError("python-docx ist nicht installiert. Bitte mit 'pip install python-docx' nachrüsten.")
-    # file_like: st.UploadedFile oder Bytes
-    if hasattr(file_like, "getvalue"):
-        data = file_like.getvalue()
-        doc = Document(io.BytesIO(data))
-    else:
-        # Falls Pfad übergeben
-        doc = Document(file_like)
-
-    items: List[Entry] = []
-
-    # Tabellen
-    for tbl in doc.tables:
-        for r_i, row in enumerate(tbl.rows):
-            cells = [c.text.strip() for c in row.cells]
-            if len(cells) < 2: 
-                continue
-            de, fr = cells[0], cells[1]
-            if not de or not fr:
+        raise RuntimeError("lxml ist nicht installiert. Bitte mit 'pip install lxml' nachrüsten.")
+    from lxml import etree  # type: ignore
+    # file_like: st.UploadedFile oder Bytes; sonst Pfad
+    src = io.BytesIO(file_like.getvalue()) if hasattr(file_like, "getvalue") else file_like
+
+    table_items: List[Entry] = []
+    para_items: List[Entry] = []
+    row_counters: List[int] = []  # Zeilenzähler je offener Tabelle (verschachtelt möglich)
+
+    with zipfile.ZipFile(src) as zf, zf.open(_main_part_name(zf, etree)) as xml:
+        for event, elem in etree.iterparse(xml, events=("start", "end"), tag=(W_TBL, W_TR, W_P), **_SAFE_PARSE):
+            if elem.tag == W_TBL:
+                if event == "start":
+                    row_counters.append(0)
+                else:
+                    row_counters.pop()
+                    if not row_counters:
+                        _release(elem)
                 continue
-            if r_i == 0 and ("de" in de.lower() and "fr" in fr.lower()):
-                # Überschriftenzeile überspringen
+            if event != "end":
                 continue
-            items.append(Entry(de=de, fr=fr, source=name_hint))
-
-    # Absätze "de ; fr"
-    for p in doc.paragraphs:
-        t = p.text.strip()
-        if ";" in t:
-            parts = [s.strip() for s in t.split(";")]
-            if len(parts) >= 2 and parts[0] and parts[1]:
-                items.append(Entry(de=parts[0], fr=parts[1], source=name_hint))
-
-    # Dedupe
-    seen = set(); uniq: List[Entry] = []
+
+            if elem.tag == W_TR:
+                # Tabellen: Text der direkten <w:tc> (ohne verbundene Zellen aufzulösen)
+                r_i = row_counters[-1]
+                row_counters[-1] += 1
+                cells = ["\n".join(_run_text(p) for p in tc.iterchildren(W_P)).strip()
+                         for tc in elem.iterchildren(W_TC)]
+                _release(elem)
+                if len(cells) < 2:
+                    continue
+                de, fr = cells[0], cells[1]
+                if not de or not fr:
+                    continue
+                if r_i == 0 and ("de" in de.lower() and "fr" in fr.lower()):
+                    # Überschriftenzeile überspringen
+                    continue
+                table_items.append(Entry(de=de, fr=fr, source=name_hint))
+
+            elif not row_counters:
+                # Absätze "de ; fr" (nur außerhalb von Tabellen)
+                t = _run_text(elem).strip()
+                _release(elem)
+                if ";" in t:
+                    parts = [s.strip() for s in t.split(";")]
+                    if len(parts) >= 2 and parts[0] and parts[1]:
+                        para_items.append(Entry(de=parts[0], fr=parts[1], source=name_hint))
+
+    items = table_items + para_items
+
+    # Dedupe (erster Treffer gewinnt, Reihenfolge bleibt erhalten)
+    by_key: Dict[Entry, Entry] = {}
     for e in items:
-        key = (normalize(e.de), normalize(e.fr))
-        if key in seen: 
-            continue
-        seen.add(key); uniq.append(e)
+        by_key.setdefault(Entry(normalize(e.de), normalize(e.fr)), e)
+    uniq: List[Entry] = list(by_key.values())
 
-    coll_name = name_hint or "Import"
+    coll_name = sys.intern(name_hint or "Import")
     return coll_name, uniq
 
 # -------------------- Built-in Sammlung --------------------
@@ -149,32 +269,47 @@ BUILTIN_COLLECTION = {
         {"de": "der Dritte Stand", "fr": "le Tiers Etat"},
     ],
 }
+def coll_index(store: Dict) -> Dict[str, int]:
+    # Name -> Position in store["collections"]; Sammlungen werden nur angehängt oder ersetzt,
+    # daher genügt ein Längenvergleich, um einen veralteten Index zu erkennen.
+    colls = store.setdefault("collections", [])
+    index = st.session_state.get("_coll_index")
+    if index is None or len(index) != len(colls):
+        index = {}
+        for i, c in enumerate(colls):
+            index.setdefault(c.get("name"), i)
+        st.session_state["_coll_index"] = index
+    return index
+
 def ensure_builtin(store: Dict) -> Dict:
-    names = [c.get("name") for c in store.get("collections", [])]
-    if BUILTIN_COLLECTION["name"] not in names:
-        store.setdefault("collections", []).append(BUILTIN_COLLECTION)
+    index = coll_index(store)
+    if BUILTIN_COLLECTION["name"] not in index:
+        store["collections"].append(BUILTIN_COLLECTION)
+        index[BUILTIN_COLLECTION["name"]] = len(store["collections"]) - 1
+        mark_dirty()
     return store
 
 # -------------------- Quiz-Helfer --------------------
 
-def qa_pair(e: Entry, mode: str) -> Tuple[str, str]:
-    return (e.de, e.fr) if mode == "DE→FR" else (e.fr, e.de)
+def qa_getters(mode: str) -> Tuple[Callable[[Entry], str], Callable[[Entry], str]]:
+    # (Frage, Antwort)-Zugriff einmal pro Quiz festlegen statt je Eintrag `mode` zu vergleichen
+    de, fr = attrgetter("de"), attrgetter("fr")
+    return (de, fr) if mode == _DE_FR else (fr, de)
+
+def collect_answers(session_items: List[Entry], get_a: Callable[[Entry], str]) -> List[str]:
+    # dict.fromkeys: eindeutig und in stabiler Reihenfolge
+    return list(dict.fromkeys(map(get_a, session_items)))
 
-def build_mc_options(correct: str, session_items: List[Entry], mode: str, all_entries: List[Entry]) -> List[str]:
-    # Kandidaten aus Session
-    all_answers = list({qa_pair(e, mode)[1] for e in session_items})
-    wrongs = [a for a in all_answers if normalize(a) != normalize(correct)]
-    random.shuffle(wrongs)
-    options = [correct] + wrongs[:3]
+def build_mc_options(correct: str, answers: List[str], get_a: Callable[[Entry], str], all_entries: List[Entry]) -> List[str]:
+    # Kandidaten aus Session (answers: einmal pro Quiz via collect_answers)
+    correct_n = normalize(correct)
+    wrongs = [a for a in answers if normalize(a) != correct_n]
+    options = [correct] + random.sample(wrongs, k=min(3, len(wrongs)))
     # Falls zu wenig Distraktoren: fülle aus globalen Einträgen
     if len(options) < 4:
-        pool_global = [qa_pair(e, mode)[1] for e in all_entries if normalize(qa_pair(e, mode)[1]) != normalize(correct)]
-        random.shuffle(pool_global)
-        for a in pool_global:
-            if a not in options:
-                options.append(a)
-            if len(options) == 4:
-                break
+        pool_global = [a for a in dict.fromkeys(map(get_a, all_entries))
+                       if a not in options and normalize(a) != correct_n]
+        options += random.sample(pool_global, k=min(4 - len(options), len(pool_global)))
     # Falls immer noch <4, notfalls doppeln
     while len(options) < 4:
         options.append(correct)
@@ -196,6 +331,33 @@ if "quiz" not in st.session_state:
 def reset_quiz():
     st.session_state.quiz = None
 
+def check_answer():
+    q = st.session_state.quiz
+    # Nur in der Frage-Phase bewerten; der Callback läuft vor dem Durchlauf, der das Formular zeichnet
+    if q is None or q["phase"] != "ask":
+        return
+    chosen = st.session_state.get(f"given_{q['i']}")
+    if not chosen:
+        q["empty_answer"] = True  # Hinweis nur im folgenden Durchlauf
+        return
+    e = q["items"][q["order"][q["i"]]]
+    q["last_ok"] = normalize(chosen) == normalize(q["get_a"](e))
+    q["last_given"] = chosen
+    q["phase"] = "feedback"
+
+def next_question():
+    q = st.session_state.quiz
+    # Nur aus der Feedback-Phase weiterschalten (z. B. Doppelklick nicht doppelt zählen)
+    if q is None or q["phase"] != "feedback":
+        return
+    e = q["items"][q["order"][q["i"]]]
+    ok = q.get("last_ok", False)
+    if ok:
+        q["score"] += 1
+    q["history"].append((q["get_q"](e), q.get("last_given", ""), "Ja" if ok else "Nein", q["get_a"](e)))
+    q["i"] += 1
+    q["phase"] = "ask"
+
 # Sidebar
 with st.sidebar:
     st.header("⚙️ Einstellungen")
@@ -222,18 +384,20 @@ with st.sidebar:
                     st.warning("Im Dokument wurden keine Paare erkannt.")
                 else:
                     new_coll = {"name": name, "items": [{"de": e.de, "fr": e.fr} for e in items]}
-                    st.session_state.store.setdefault("collections", [])
-                    names = [c.get("name") for c in st.session_state.store["collections"]]
-                    if name in names:
+                    index = coll_index(st.session_state.store)
+                    if name in index:
                         if overwrite:
-                            idx = names.index(name)
+                            idx = index[name]
                             st.session_state.store["collections"][idx] = new_coll
+                            mark_dirty()
                             save_store(st.session_state.store)
                             st.success(f"{len(items)} Einträge in '{name}' importiert (überschrieben).")
                         else:
                             st.error(f"Sammlung '{name}' existiert bereits. Aktiviere 'überschreiben' oder wähle einen anderen Namen.")
                     else:
                         st.session_state.store["collections"].append(new_coll)
+                        index[name] = len(st.session_state.store["collections"]) - 1
+                        mark_dirty()
                         save_store(st.session_state.store)
                         st.success(f"{len(items)} Einträge in '{name}' importiert.")
                     reset_quiz()
@@ -265,10 +429,10 @@ if st.session_state.quiz is None:
     cols = st.columns([1.4, 1, 1, 1])
     with cols[0]:
         # Sammlung
-        opts = ["(alle)"] + [c.get("name","?") for c in store.get("collections", [])]
+        opts = [_ALL] + [c.get("name","?") for c in store.get("collections", [])]
         coll = st.selectbox("Sammlung", options=opts, index=0)
     with cols[1]:
-        mode = st.radio("Richtung", options=("DE→FR", "FR→DE"), horizontal=False)
+        mode = st.radio("Richtung", options=(_DE_FR, _FR_DE), horizontal=False)
     with cols[2]:
         quiztype = st.radio("Quiztyp", options=("Multiple Choice", "Freitext"), horizontal=False)
     with cols[3]:
@@ -276,7 +440,7 @@ if st.session_state.quiz is None:
 
     # Filter Einträge
     entries = all_entries
-    if coll != "(alle)":
+    if coll != _ALL:
         entries = [e for e in entries if e.source == coll]
 
     if st.button("🎯 Quiz starten", disabled=len(entries) < 4):
@@ -284,16 +448,26 @@ if st.session_state.quiz is None:
         chosen = random.sample(entries, n)
         order = list(range(n))
         random.shuffle(order)
+        get_q, get_a = qa_getters(mode)
+        answers = collect_answers(chosen, get_a)
+        # MC-Optionen einmal pro Quiz erzeugen; beim Rendern nur noch Nachschlagen
+        mc_options = {}
+        if quiztype == "Multiple Choice":
+            for qi, idx in enumerate(order):
+                mc_options[qi] = build_mc_options(get_a(chosen[idx]), answers, get_a, all_entries)
         st.session_state.quiz = {
-            "items": [{"de": e.de, "fr": e.fr, "source": e.source} for e in chosen],
+            "items": chosen,  # Entry-Objekte, einmal pro Quiz
+            "answers": answers,
             "order": order,
             "i": 0,
             "score": 0,
             "history": [],  # (question, given, ok, correct)
             "mode": mode,
+            "get_q": get_q,
+            "get_a": get_a,
             "quiztype": quiztype,
             "phase": "ask",  # "ask" -> "feedback"
-            "cached_options": {},  # idx -> options list (MC)
+            "cached_options": mc_options,  # Frage-Nr. -> Optionen (MC)
         }
 
     st.markdown("### 📊 Datenbank")
@@ -306,7 +480,7 @@ if st.session_state.quiz is None:
 # ----------- Quiz-Ansicht -----------
 else:
     q = st.session_state.quiz
-    items = [Entry(**it) for it in q["items"]]
+    items = q["items"]
     order = q["order"]
     i = q["i"]
     mode = q["mode"]
@@ -319,14 +493,15 @@ else:
         score = q["score"]
         st.success(f"Fertig! Punktzahl: **{score}/{total}** ({round(100*score/total)}%)")
         st.markdown("#### Auswertung")
-        # Tabelle
-        import pandas as pd
-        df = pd.DataFrame(q["history"], columns=["Frage", "Ihre Antwort", "Korrekt", "Richtig"])
-        st.dataframe(df, use_container_width=True, hide_index=True)
+        # Tabelle (einmal erzeugen, bei weiteren Reruns wiederverwenden)
+        if "_df" not in q:
+            import pandas as pd
+            q["_df"] = pd.DataFrame(q["history"], columns=["Frage", "Ihre Antwort", "Korrekt", "Richtig"])
+        st.dataframe(q["_df"], use_container_width=True, hide_index=True)
         st.button("Zur Startseite", on_click=reset_quiz)
     else:
         e = items[order[i]]
-        prompt, correct = qa_pair(e, mode)
+        prompt, correct = q["get_q"](e), q["get_a"](e)
 
         topc1, topc2 = st.columns([2,1])
         with topc1:
@@ -336,54 +511,41 @@ else:
 
         st.markdown(f"**Übersetze:** {prompt}")
 
-        # Eingabe-Bereich
-        given_key = f"given_{i}"
-        if quiztype == "Multiple Choice":
-            # Optionen cachen, damit sie über die Phasen stabil bleiben
-            if i not in q["cached_options"]:
-                opts = build_mc_options(correct, [items[idx] for idx in order], mode, all_entries)
-                q["cached_options"][i] = opts
-            else:
+        # Eingabe + Prüfen als Formular: Antwort wird erst beim Absenden übertragen und im
+        # Callback bewertet; der Durchlauf danach zeigt direkt das Feedback (kein st.rerun).
+        # In der Feedback-Phase ist das Formular gesperrt und zeigt die bewertete Antwort
+        # (eigenes gesperrtes Widget; das Eingabe-Widget würde beim Sperren seinen Wert verlieren).
+        locked = phase != "ask"
+        given_key = f"given_{i}_graded" if locked else f"given_{i}"
+        graded = q.get("last_given") if locked else None
+        with st.form(f"answer_form_{i}"):
+            if quiztype == "Multiple Choice":
+                # Optionen beim Quizstart erzeugt, damit sie über die Phasen stabil bleiben
                 opts = q["cached_options"][i]
-            chosen = st.radio("Option wählen", options=opts, index=None, key=given_key)
-            st.caption("Tipp: Akzente/Großschreibung egal.")
-        else:
-            default_val = "" if given_key not in st.session_state else st.session_state[given_key]
-            chosen = st.text_input("Antwort eingeben", value=default_val, key=given_key)
-            st.caption("Tipp: Akzente/Großschreibung egal. Bestätige mit **Prüfen**.")
+                st.radio("Option wählen", options=opts, key=given_key, disabled=locked,
+                         index=opts.index(graded) if graded in opts else None)
+                st.caption("Tipp: Akzente/Großschreibung egal.")
+            else:
+                if locked:
+                    default_val = graded or ""
+                else:
+                    default_val = "" if given_key not in st.session_state else st.session_state[given_key]
+                st.text_input("Antwort eingeben", value=default_val, key=given_key, disabled=locked)
+                st.caption("Tipp: Akzente/Großschreibung egal. Bestätige mit **Prüfen**.")
+            st.form_submit_button("Prüfen", on_click=check_answer, disabled=locked)
 
-        colb1, colb2 = st.columns([1,4])
-
-        # Phase: ask -> prüfen
-        if phase == "ask":
-            with colb1:
-                if st.button("Prüfen"):
-                    if not chosen:
-                        st.warning("Bitte eine Antwort eingeben/auswählen.")
-                    else:
-                        ok = normalize(chosen) == normalize(correct)
-                        # Feedback speichern
-                        q["last_ok"] = ok
-                        q["last_given"] = chosen
-                        q["phase"] = "feedback"
-                        st.rerun()
+        # Phase: ask -> prüfen (leere Antwort)
+        if q.pop("empty_answer", False):
+            st.warning("Bitte eine Antwort eingeben/auswählen.")
 
         # Phase: feedback -> weiter
-        elif phase == "feedback":
-            ok = q.get("last_ok", False)
-            chosen = q.get("last_given", "")
-            if ok:
+        if phase == "feedback":
+            if q.get("last_ok", False):
                 st.success("✔️ Richtig!")
             else:
                 st.error(f"✖️ Falsch. **Richtig:** {correct}")
 
-            # Weiter-Button
+            # Weiter-Button: Callback läuft vor dem nächsten Durchlauf, der direkt die neue Frage zeigt
+            colb1, colb2 = st.columns([1,4])
             with colb1:
-                if st.button("Weiter"):
-                    if ok:
-                        q["score"] += 1
-                    q["history"].append((prompt, chosen, "Ja" if ok else "Nein", correct))
-                    q["i"] += 1
-                    q["phase"] = "ask"
-                    st.rerun()
-
+                st.button("Weiter", on_click=next_question)